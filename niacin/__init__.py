@@ -1 +1,3 @@
-__version__ = "0.5.1"
\ No newline at end of file
+__version__ = "0.5.1"
+
+from ._rng import seed
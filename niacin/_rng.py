@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+
+"""
+Random number generation shared by niacin's enrichment functions.
+
+Every module draws from the same generator, so that a single call to
+``niacin.seed`` makes all of them reproducible.
+"""
+
+import typing
+
+import numpy as np
+
+
+_seed_sequence = np.random.SeedSequence()
+RNG = np.random.default_rng(_seed_sequence)
+
+
+def seed(seed: typing.Union[None, int, np.random.SeedSequence] = None):
+    """Reseed the random number generator used by niacin's functions.
+
+    The generator is reseeded in place, so modules that hold a reference to
+    it see the new state. Parallel workers (e.g. in a torch DataLoader's
+    ``worker_init_fn``) should each be given their own child of a
+    ``numpy.random.SeedSequence``, so that their streams are independent.
+
+    Args:
+        seed: seed to use for the random number generator
+    """
+    global _seed_sequence
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    _seed_sequence = seed
+    RNG.bit_generator.state = np.random.PCG64(seed).state
+
+
+def spawn(n: int) -> typing.List[np.random.SeedSequence]:
+    """Derive seeds for n independent streams from the current seed.
+
+    The children depend only on the seed given to ``seed`` (and on how many
+    have been spawned before), so workers seeded with them are reproducible.
+
+    Args:
+        n: number of streams
+
+    Returns:
+        seed sequences
+    """
+    return _seed_sequence.spawn(n)
+
+
+def sample_positions(n: int, p: float) -> np.ndarray:
+    """Pick each of n positions with probability p, in increasing order.
+
+    Draws how many positions are picked, then which ones, instead of drawing
+    a number for every position, which is much cheaper for small p.
+
+    Args:
+        n: number of positions
+        p: probability of picking each position
+
+    Returns:
+        picked positions
+    """
+    k = RNG.binomial(n, p)
+    return np.sort(RNG.choice(n, size=k, replace=False))
+
+
+def swap_positions(flips: np.ndarray) -> np.ndarray:
+    """Pick which adjacent pairs to swap, given a flip for each pair.
+
+    Pairs are considered from left to right, and a flip is ignored when the
+    pair before it was swapped, so that nothing moves more than once. Within
+    a run of consecutive flips, that keeps every other one.
+
+    Args:
+        flips: whether each pair (i, i + 1) was drawn for swapping
+
+    Returns:
+        left-hand positions of the pairs to swap
+    """
+    index = np.arange(len(flips))
+    run_starts = flips & ~np.concatenate(([False], flips[:-1]))
+    run_start = np.maximum.accumulate(np.where(run_starts, index, 0))
+    return np.flatnonzero(flips & ((index - run_start) % 2 == 0))
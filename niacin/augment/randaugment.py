@@ -52,7 +52,7 @@ class RandAugment:
         shuffle: bool = True,
         seed: int = None
     ):
-        self._transforms = list(transforms)
+        self._transforms = tuple(transforms)
         self.n = n
         self.m = m
         self._shuffle = shuffle
@@ -62,12 +62,12 @@ class RandAugment:
         return len(self._transforms)
 
     def __iter__(self):
-        choices = [
-            partial(fun, p=self._p) for fun in self._rng.choice(
-                self._transforms, size=self._n, replace=False, shuffle=self._shuffle
-            )
-        ]
-        return iter(choices)
+        # sample positions rather than the callables themselves, which numpy
+        # would otherwise have to box into an object array on every call
+        indices = self._rng.choice(
+            len(self._transforms), size=self._n, replace=False, shuffle=self._shuffle
+        )
+        return (partial(self._transforms[index], p=self._p) for index in indices)
 
     @property
     def n(self) -> int:
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+
+"""
+Apply an enrichment function to many strings at once, in parallel.
+
+Every enrichment function works on one string at a time, independently of
+the others, so a dataset can be spread across workers instead of being
+enriched in a single-threaded loop.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import typing
+
+import numpy as np
+
+from niacin import _rng
+
+
+def apply(
+    fn: typing.Callable[..., str],
+    strings: typing.Iterable[str],
+    n_jobs: typing.Optional[int] = None,
+    processes: bool = False,
+    **kwargs,
+) -> typing.List[str]:
+    """Apply an enrichment function to every string in an iterable.
+
+    Threads are used by default, which suits the functions that spend their
+    time in numpy or in compiled regular expressions. For functions that are
+    mostly pure Python (e.g. the wordnet-based ones), processes avoid
+    contention over the GIL. With processes, every chunk of strings is
+    enriched with its own stream, spawned from the current seed, so results
+    are reproducible with ``niacin.seed`` for a given ``n_jobs``, however
+    the chunks are scheduled.
+    Threads share one stream, so the order of their draws is not.
+
+    Args:
+        fn: enrichment function, e.g. ``niacin.text.en.add_whitespace``
+        strings: texts
+        n_jobs: number of workers (defaults to the number of CPUs)
+        processes: use worker processes instead of threads
+        kwargs: passed on to ``fn``, e.g. ``p=0.1``
+
+    Returns:
+        enriched texts, in the same order as the input
+
+    Examples:
+        >>> from niacin.text import batch, en
+        >>> batch.apply(en.add_whitespace, ["one", "two"], p=0.0)
+        ['one', 'two']
+    """
+    strings = list(strings)
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    call = _Call(fn, kwargs)
+    if not processes:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(call, strings))
+    size = max(1, len(strings) // (4 * n_jobs))
+    chunks = [strings[start : start + size] for start in range(0, len(strings), size)]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        results = executor.map(call.chunk, _rng.spawn(len(chunks)), chunks)
+        return [string for chunk in results for string in chunk]
+
+
+class _Call:
+    """Picklable stand-in for ``lambda string: fn(string, **kwargs)``."""
+
+    def __init__(self, fn: typing.Callable[..., str], kwargs: typing.Dict):
+        self.fn = fn
+        self.kwargs = kwargs
+
+    def __call__(self, string: str) -> str:
+        return self.fn(string, **self.kwargs)
+
+    def chunk(
+        self, seed: np.random.SeedSequence, strings: typing.List[str]
+    ) -> typing.List[str]:
+        _rng.seed(seed)
+        return [self(string) for string in strings]
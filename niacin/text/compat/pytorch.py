@@ -9,6 +9,8 @@
 """
 
 import collections
+from concurrent.futures import ThreadPoolExecutor
+import numbers
 import os
 from pathlib import Path
 import typing as t
@@ -16,10 +18,19 @@ import typing as t
 from nltk import WordPunctTokenizer
 import pandas as pd
 import torch
+from torch.nn.utils.rnn import pad_sequence
 from torch.utils.data import Dataset
 from torchtext.vocab import Vocab
 
 
+# shared by every dataset that is not given a tokenizer, so the tokenizer is
+# built once per process rather than once per dataset
+_DEFAULT_TOKENIZER = WordPunctTokenizer().tokenize
+
+# threads reading files while the vocabulary is built
+_READ_THREADS = 8
+
+
 class TextDatasetMixin:
 
     _data: t.Sequence
@@ -33,8 +44,7 @@ class TextDatasetMixin:
         # vocabulary
         counter.update(["<unk>", "<pad>"])
         for doc in self._data:
-            for token in self._tokenizer(doc):
-                counter.update([token])
+            counter.update(self._tokenizer(doc))
         return Vocab(counter)
 
     def _tokenize(self, text: str) -> t.List[str]:
@@ -46,7 +56,13 @@ class TextDatasetMixin:
         return text
 
     def _vectorize(self, tokens: t.List[str]) -> torch.Tensor:
-        return torch.tensor([self._vocab[token] for token in tokens])
+        # newer versions of torchtext look up all of the tokens in one call
+        lookup_indices = getattr(self._vocab, "lookup_indices", None)
+        if lookup_indices is not None:
+            indices = lookup_indices(tokens)
+        else:
+            indices = [self._vocab[token] for token in tokens]
+        return torch.as_tensor(indices, dtype=torch.int64)
 
 
 class MemoryTextDataset(Dataset, TextDatasetMixin):
@@ -60,6 +76,10 @@ class MemoryTextDataset(Dataset, TextDatasetMixin):
             class
         tokenizer: a function that receives text and returns tokens
         vocab: a PyTorch Vocab object
+
+    When there are no transforms, every document always produces the same
+    vector, so the vectors are computed once at construction and reused.
+    Items are copies of the cached vectors, so they are safe to modify.
     """
 
     def __init__(
@@ -77,25 +97,62 @@ class MemoryTextDataset(Dataset, TextDatasetMixin):
         else:
             self._transforms = transforms
         if tokenizer is None:
-            self._tokenizer = WordPunctTokenizer().tokenize  # type: ignore
+            self._tokenizer = _DEFAULT_TOKENIZER  # type: ignore
         else:
             self._tokenizer = tokenizer  # type: ignore
         if vocab is None:
             self._vocab = self._build_vocab()
         else:
             self._vocab = vocab
+        self._cache: t.Optional[t.List[torch.Tensor]] = None
+        if not self._transforms:
+            self._cache = [self._vectorize(self._tokenize(doc)) for doc in self._data]
 
     def __len__(self) -> int:
         return len(self._labels)
 
     def __getitem__(self, index: int) -> t.Tuple[torch.Tensor, t.Union[int, float]]:
         label = self._labels[index]
+        if self._cache is not None:
+            # a copy, so that changing the returned tensor cannot change the cache
+            return self._cache[index].clone(), label
         data = self._data[index]
         data = self._transform(data)
         tokens = self._tokenize(data)
         vector = self._vectorize(tokens)
         return vector, label
 
+    def get_batch(self, indices: t.Sequence[int]) -> t.Tuple[torch.Tensor, torch.Tensor]:
+        """Fetch several examples at once, padded into a single tensor.
+
+        Intended to be used as the collate function of a DataLoader that
+        iterates over indices, so that a whole batch is built in one call:
+
+        ``DataLoader(range(len(dataset)), batch_size=32, collate_fn=dataset.get_batch)``
+
+        Args:
+            indices: positions of the examples in the dataset
+
+        Returns:
+            token ids of shape (batch, longest example), padded with the
+            ``<pad>`` token, and the labels: a tensor when they are all
+            numbers, otherwise a list
+        """
+        if self._cache is not None:
+            vectors = [self._cache[index] for index in indices]
+        else:
+            vectors = [
+                self._vectorize(self._tokenize(self._transform(self._data[index])))
+                for index in indices
+            ]
+        padded = pad_sequence(
+            vectors, batch_first=True, padding_value=self._vocab["<pad>"]
+        )
+        labels = [self._labels[index] for index in indices]
+        if all(isinstance(label, numbers.Number) for label in labels):
+            return padded, torch.as_tensor(labels)
+        return padded, labels
+
 
 class FileTextDataset(MemoryTextDataset):
     """A text dataset for data that is in a single file on disk. The reader
@@ -119,21 +176,21 @@ class FileTextDataset(MemoryTextDataset):
         tokenizer: t.Callable = None,
         vocab: Vocab = None,
     ):
-        df = pd.read_table(datafile, sep=sep)
-        self._data = df.iloc[:, 1:].apply(lambda s: s.str.cat(sep=" "), axis=1).tolist()
-        self._labels = df.iloc[:, 0].tolist()
-        if transforms is None:
-            self._transforms = []
-        else:
-            self._transforms = transforms
-        if tokenizer is None:
-            self._tokenizer = WordPunctTokenizer().tokenize  # type: ignore
-        else:
-            self._tokenizer = tokenizer  # type: ignore
-        if vocab is None:
-            self._vocab = self._build_vocab()
-        else:
-            self._vocab = vocab
+        df = pd.read_csv(datafile, sep=sep)
+        # join the text columns a column at a time, rather than row by row,
+        # skipping missing cells so that they leave no extra spaces behind
+        columns = [
+            column.astype(str).where(column.notna())
+            for _, column in df.iloc[:, 1:].items()
+        ]
+        joined = columns[0]
+        for column in columns[1:]:
+            joined = joined.str.cat(column, sep=" ").fillna(joined).fillna(column)
+        data = joined.fillna("").tolist()
+        labels = df.iloc[:, 0].tolist()
+        super().__init__(
+            data, labels, transforms=transforms, tokenizer=tokenizer, vocab=vocab
+        )
 
 
 class DirectoryTextDataset(Dataset, TextDatasetMixin):
@@ -178,7 +235,7 @@ class DirectoryTextDataset(Dataset, TextDatasetMixin):
         else:
             self._transforms = transforms
         if tokenizer is None:
-            self._tokenizer = WordPunctTokenizer().tokenize  # type: ignore
+            self._tokenizer = _DEFAULT_TOKENIZER  # type: ignore
         else:
             self._tokenizer = tokenizer  # type: ignore
         if vocab is None:
@@ -207,10 +264,19 @@ class DirectoryTextDataset(Dataset, TextDatasetMixin):
         # older versions of torchtext require special symbols to be in the
         # vocabulary
         counter.update(["<unk>", "<pad>"])
-        for filename in self._data:
-            fp = self._data_dir / filename
-            with open(fp) as f:
-                doc = f.read()
-            for token in self._tokenizer(doc):
-                counter.update([token])
+        # reading the files is bound by I/O latency, so overlap the reads
+        # across threads, but keep only a few files in memory at a time; the
+        # tokenizer may not be thread-safe, so it runs on this thread
+        with ThreadPoolExecutor(max_workers=_READ_THREADS) as executor:
+            pending: t.Deque = collections.deque()
+            for filename in self._data:
+                pending.append(executor.submit(self._read_file, filename))
+                if len(pending) >= 2 * _READ_THREADS:
+                    counter.update(self._tokenizer(pending.popleft().result()))
+            while pending:
+                counter.update(self._tokenizer(pending.popleft().result()))
         return Vocab(counter)
+
+    def _read_file(self, filename: str) -> str:
+        with open(self._data_dir / filename) as f:
+            return f.read()
@@ -26,10 +26,15 @@ Word-based
 ----------
 
 * add_hypernyms
+* add_hypernyms_batch
 * add_hyponyms
+* add_hyponyms_batch
 * add_misspelling
+* add_misspelling_batch
 * add_parens
+* add_parens_batch
 * add_synonyms
+* add_synonyms_batch
 * remove_articles
 * swap_words
 
@@ -38,30 +43,63 @@ Sentence-based
 
 * add_applause
 * add_backtranslation
+* add_backtranslation_batch
 * add_bytes
 * add_love
 """
 
-from .char import (
-    add_characters,
-    add_contractions,
-    remove_contractions,
-    add_fat_thumbs,
-    add_leet,
-    add_macbook_keyboard,
-    add_whitespace,
-    remove_characters,
-    remove_punctuation,
-    remove_whitespace,
-    swap_chars,
-)
-from .sentence import add_applause, add_backtranslation, add_bytes, add_love
-from .word import (
-    add_hypernyms,
-    add_hyponyms,
-    add_misspelling,
-    add_parens,
-    add_synonyms,
-    remove_articles,
-    swap_words,
-)
+import importlib
+import typing
+
+# submodules are imported on first use, so that importing one family of
+# functions does not load the data and dependencies of the others
+_MODULES = {
+    "add_characters": "char",
+    "add_contractions": "char",
+    "remove_contractions": "char",
+    "add_fat_thumbs": "char",
+    "add_leet": "char",
+    "add_macbook_keyboard": "char",
+    "add_whitespace": "char",
+    "remove_characters": "char",
+    "remove_punctuation": "char",
+    "remove_whitespace": "char",
+    "swap_chars": "char",
+    "add_applause": "sentence",
+    "add_backtranslation": "sentence",
+    "add_backtranslation_batch": "sentence",
+    "add_bytes": "sentence",
+    "add_love": "sentence",
+    "add_hypernyms": "word",
+    "add_hypernyms_batch": "word",
+    "add_hyponyms": "word",
+    "add_hyponyms_batch": "word",
+    "add_misspelling": "word",
+    "add_misspelling_batch": "word",
+    "add_parens": "word",
+    "add_parens_batch": "word",
+    "add_synonyms": "word",
+    "add_synonyms_batch": "word",
+    "remove_articles": "word",
+    "swap_words": "word",
+}
+
+_SUBMODULES = frozenset(_MODULES.values())
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(_MODULES) | _SUBMODULES)
@@ -20,12 +20,21 @@ Importable functions include:
 """
 
 import collections
+import functools
+import itertools
 import json
-from pkg_resources import resource_string
+import pkgutil
 from string import ascii_letters, punctuation
 import typing
 
-from scipy import random
+import numpy as np
+import regex
+
+from niacin._rng import (
+    RNG as _RNG,
+    sample_positions as _sample_positions,
+    swap_positions as _swap_positions,
+)
 
 
 LEETMAP = collections.OrderedDict(
@@ -45,11 +54,84 @@ LEETMAP = collections.OrderedDict(
     ]
 )
 
-CONTRACT = json.loads(
-    resource_string("niacin", "data/contractions.json").decode("utf-8")
-)
+CONTRACT = json.loads(pkgutil.get_data("niacin", "data/contractions.json"))
 EXPAND = {v: k for k, v in CONTRACT.items()}
-NEIGHBORS = json.loads(resource_string("niacin", "data/neighbors.json").decode("utf-8"))
+NEIGHBORS = json.loads(pkgutil.get_data("niacin", "data/neighbors.json"))
+
+# single characters that are removed independently of each other; the
+# capture groups keep them in the output of split
+P_PUNCTUATION = regex.compile("([" + regex.escape(punctuation) + "])")
+P_SINGLE_SPACE = regex.compile("( )")
+
+
+# surrogatepass lets lone surrogates (e.g. from decoding with surrogateescape)
+# make the round trip, as they do through ordinary str operations
+def _to_codepoints(string: str) -> np.ndarray:
+    return np.frombuffer(string.encode("utf-32-le", "surrogatepass"), dtype="<u4")
+
+
+def _from_codepoints(codepoints: np.ndarray) -> str:
+    data = codepoints.astype("<u4", copy=False).tobytes()
+    return data.decode("utf-32-le", "surrogatepass")
+
+
+def _interleave(
+    string: str, positions: typing.Sequence[int], inserts: typing.Iterable[str]
+) -> str:
+    """Insert a string in front of each position, in increasing order.
+
+    The text is joined back together once from the slices between positions,
+    rather than being rebuilt after every insertion.
+
+    Args:
+        string: text
+        positions: sorted offsets, from 0 to len(string) inclusive
+        inserts: strings to insert, one for each position
+
+    Returns:
+        text with insertions
+    """
+    pieces = []
+    start = 0
+    for position, insert in zip(positions, inserts):
+        pieces += (string[start:position], insert)
+        start = position
+    pieces.append(string[start:])
+    return "".join(pieces)
+
+
+def _build_neighbor_table(
+    neighbors: typing.Mapping[str, typing.Sequence[str]]
+) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten a map of char -> neighbors into arrays indexed by codepoint.
+
+    Returns the codepoints of all neighbors back to back, and for each
+    codepoint up to the largest key, the offset of its neighbors in that
+    array and how many there are (zero for characters without neighbors).
+    """
+    size = max(map(ord, neighbors), default=-1) + 1
+    offsets = np.zeros(size, dtype=np.int64)
+    counts = np.zeros(size, dtype=np.int64)
+    offset = 0
+    for char, values in neighbors.items():
+        offsets[ord(char)] = offset
+        counts[ord(char)] = len(values)
+        offset += len(values)
+    flat = _to_codepoints("".join("".join(values) for values in neighbors.values()))
+    return flat, offsets, counts
+
+
+_NEIGHBOR_CHARS, _NEIGHBOR_OFFSETS, _NEIGHBOR_COUNTS = _build_neighbor_table(NEIGHBORS)
+
+
+def _find_all(string: str, pattern: str) -> typing.List[int]:
+    """Return the start of every non-overlapping occurrence of pattern."""
+    starts = []
+    index = string.find(pattern)
+    while index >= 0:
+        starts.append(index)
+        index = string.find(pattern, index + len(pattern))
+    return starts
 
 
 def _sub_chars(string: str, probability: float, mapping: typing.Mapping) -> str:
@@ -68,27 +150,60 @@ def _sub_chars(string: str, probability: float, mapping: typing.Mapping) -> str:
     Returns:
         enriched text
     """
+    # lowercase once, and keep the lowercased copy in step with the edits
+    lowered = string.lower()
     for pattern, sub in mapping.items():
-        index = 0
-        while 0 <= index < len(string):
-            index = string.lower().find(pattern, index)
-            if index < 0:
-                break
-            elif random.binomial(1, probability):
-                string = string[:index] + sub + string[index + len(pattern) :]
-                index += len(sub)
-            else:
-                index += len(pattern)
+        # most patterns do not occur at all, and `in` is the cheapest check
+        if pattern not in lowered:
+            continue
+        starts = _find_all(lowered, pattern)
+        # there are only ever a few matches, too few for numpy to pay off
+        hits = [draw < probability for draw in _RNG.random(len(starts)).tolist()]
+        if not any(hits):
+            continue
+        lowered_sub = sub.lower()
+        pieces = []
+        lowered_pieces = []
+        start = 0
+        for index in itertools.compress(starts, hits):
+            pieces += (string[start:index], sub)
+            lowered_pieces += (lowered[start:index], lowered_sub)
+            start = index + len(pattern)
+        string = "".join(pieces) + string[start:]
+        lowered = "".join(lowered_pieces) + lowered[start:]
     return string
 
 
+def _remove_matches(string: str, probability: float, pattern: regex.Pattern) -> str:
+    """Remove matches of a pattern with a given probability.
+
+    Unlike ``_sub_chars``, every match is found with one scan of the text.
+    This is only equivalent when removing one match cannot create another,
+    e.g. for a pattern that matches single characters.
+
+    Args:
+        string: text
+        probability: probability of removing each match
+        pattern: compiled pattern, with the whole match in a capture group
+
+    Returns:
+        enriched text
+    """
+    # split alternates between the text around matches and the matches
+    parts = pattern.split(string)
+    hits = _RNG.random(len(parts) // 2) < probability
+    for index in np.flatnonzero(hits):
+        parts[2 * index + 1] = ""
+    return "".join(parts)
+
+
 def add_fat_thumbs(string: str, p: float = 0.01) -> str:
     """Replace characters with QWERTY neighbors.
 
     One source of typographic mistakes comes from pressing a nearby key
     on a keyboard (or on a touchscreen). With probability p, replace each
     character is a string with one from a set of its neighbors. The
-    replacement is chosen using ``random.choice``.
+    replacement is chosen uniformly from those neighbors.
 
     Args:
         string: text
@@ -97,11 +212,14 @@ def add_fat_thumbs(string: str, p: float = 0.01) -> str:
     Returns:
         enriched text
     """
-    for index, char in enumerate(string):
-        if char in NEIGHBORS and random.binomial(1, p):
-            new_char = random.choice(NEIGHBORS[char])
-            string = string[:index] + new_char + string[index + 1 :]
-    return string
+    codepoints = _to_codepoints(string).copy()
+    positions = _sample_positions(len(codepoints), p)
+    positions = positions[codepoints[positions] < len(_NEIGHBOR_COUNTS)]
+    counts = _NEIGHBOR_COUNTS[codepoints[positions]]
+    hits, counts = positions[counts > 0], counts[counts > 0]
+    offsets = _NEIGHBOR_OFFSETS[codepoints[hits]] + _RNG.integers(counts)
+    codepoints[hits] = _NEIGHBOR_CHARS[offsets]
+    return _from_codepoints(codepoints)
 
 
 def add_characters(string: str, p: float = 0.01) -> str:
@@ -117,11 +235,9 @@ def add_characters(string: str, p: float = 0.01) -> str:
     Returns:
         enriched text
     """
-    for index in reversed(range(len(string))):
-        if random.binomial(1, p):
-            new_char = random.choice(list(ascii_letters))
-            string = string[:index] + new_char + string[index:]
-    return string
+    positions = _sample_positions(len(string), p)
+    picks = _RNG.integers(len(ascii_letters), size=len(positions))
+    return _interleave(string, positions, [ascii_letters[pick] for pick in picks])
 
 
 def add_contractions(string: str, p: float = 0.5) -> str:
@@ -197,11 +313,11 @@ def add_macbook_keyboard(string: str, p: float = 0.1) -> str:
     Returns:
         enriched text
     """
-    for index in reversed(range(len(string))):
-        if random.binomial(1, p):
-            count = random.choice([0, 2])
-            string = string[:index] + string[index]*count + string[index+1:]
-    return string
+    codepoints = _to_codepoints(string)
+    positions = _sample_positions(len(codepoints), p)
+    repeats = np.ones(len(codepoints), dtype=np.int64)
+    repeats[positions] = 2 * _RNG.integers(2, size=len(positions))
+    return _from_codepoints(np.repeat(codepoints, repeats))
 
 
 def add_whitespace(string: str, p: float = 0.01) -> str:
@@ -218,11 +334,8 @@ def add_whitespace(string: str, p: float = 0.01) -> str:
     Returns:
         enriched text
     """
-    space = " "
-    for index in range(len(string), -1, -1):
-        if random.binomial(1, p):
-            string = string[:index] + space + string[index:]
-    return string
+    positions = _sample_positions(len(string) + 1, p)
+    return _interleave(string, positions, itertools.repeat(" "))
 
 
 def remove_characters(string: str, p: float = 0.01) -> str:
@@ -235,10 +348,9 @@ def remove_characters(string: str, p: float = 0.01) -> str:
     Returns:
         enriched text
     """
-    for index in reversed(range(len(string))):
-        if random.binomial(1, p):
-            string = string[:index] + string[index + 1 :]
-    return string
+    codepoints = _to_codepoints(string)
+    positions = _sample_positions(len(codepoints), p)
+    return _from_codepoints(np.delete(codepoints, positions))
 
 
 def remove_punctuation(string: str, p: float = 0.25) -> str:
@@ -256,8 +368,7 @@ def remove_punctuation(string: str, p: float = 0.25) -> str:
     Returns:
         enriched text
     """
-    mapping = {k: "" for k in punctuation}
-    return _sub_chars(string, probability=p, mapping=mapping)
+    return _remove_matches(string, probability=p, pattern=P_PUNCTUATION)
 
 
 def remove_whitespace(string: str, p: float = 0.1) -> str:
@@ -274,8 +385,7 @@ def remove_whitespace(string: str, p: float = 0.1) -> str:
     Returns:
         enriched text
     """
-    mapping = {" ": ""}
-    return _sub_chars(string, probability=p, mapping=mapping)
+    return _remove_matches(string, probability=p, pattern=P_SINGLE_SPACE)
 
 
 def swap_chars(string: str, p: float = 0.05) -> str:
@@ -301,12 +411,9 @@ def swap_chars(string: str, p: float = 0.05) -> str:
 
     .. _noisemix : https://github.com/noisemix/noisemix
     """
-    chars = list(string)
-    index = 0
-    while index < len(chars) - 1:
-        if random.binomial(1, p):
-            chars[index], chars[index + 1] = chars[index + 1], chars[index]
-            index += 2
-        else:
-            index += 1
-    return "".join(chars)
+    codepoints = _to_codepoints(string).copy()
+    flips = np.zeros(max(len(codepoints) - 1, 0), dtype=bool)
+    flips[_sample_positions(len(flips), p)] = True
+    left = _swap_positions(flips)
+    codepoints[left], codepoints[left + 1] = codepoints[left + 1], codepoints[left]
+    return _from_codepoints(codepoints)
@@ -8,16 +8,22 @@ Importable functions include:
 
 * add_applause
 * add_backtranslation
+* add_backtranslation_batch
 * add_bytes
 * add_love
 """
 
-import regex
-from scipy import random
+import typing
 import warnings
 
+import regex
+
+from niacin._rng import RNG as _RNG
+
+
+P_SPACE = regex.compile(r"\s+")
 
-P_SPACE = regex.compile(r"(\s+)")
+_CLAP = "\U0001f44f"
 
 
 class _Translator:
@@ -25,7 +31,8 @@ class _Translator:
 
     On first initialization, the instance loads language models and stores
     them as attributes on the class. New instances after this do not reload
-    them. Currently implements translation from English to German, and the
+    them, and ``_Translator.instance()`` returns one shared instance.
+    Currently implements translation from English to German, and the
     reverse.
 
     Attributes
@@ -41,14 +48,24 @@ class _Translator:
     """
 
     translators: dict = {}
+    _instance: typing.Optional["_Translator"] = None
 
     def __init__(self):
         self.load_models()
         self.en2de = self.translators["en2de"].translate
         self.de2en = self.translators["de2en"].translate
 
+    @classmethod
+    def instance(cls) -> "_Translator":
+        """Return the shared instance, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
     @classmethod
     def load_models(cls, force: bool = False):
+        if not force and "en2de" in cls.translators and "de2en" in cls.translators:
+            return
         warnings.warn(
             "Backtranslation uses large translation models (~6GB) and can "
             "hours to download on the first use."
@@ -81,6 +98,10 @@ class _Translator:
     def backtranslate(self, string: str) -> str:
         return self.de2en(self.en2de(string))
 
+    def backtranslate_batch(self, strings: typing.List[str]) -> typing.List[str]:
+        # fairseq translates a list of sentences as batches
+        return self.de2en(self.en2de(strings))
+
 
 def add_applause(string: str, p: float = 0.1) -> str:
     """Replace whitespace with clapping emojis.
@@ -97,8 +118,8 @@ def add_applause(string: str, p: float = 0.1) -> str:
     Returns:
         enriched text
     """
-    if random.binomial(1, p):
-        string = P_SPACE.sub("\U0001f44f", string)
+    if _RNG.random() < p:
+        string = P_SPACE.sub(_CLAP, string)
     return string
 
 
@@ -120,8 +141,8 @@ def add_bytes(string: str, p: float = 0.1, length: int = 100) -> str:
     Returns:
         enriched text
     """
-    if random.binomial(1, p):
-        string = string + random.bytes(length).decode("utf-8", errors="replace")
+    if _RNG.random() < p:
+        string = string + _RNG.bytes(length).decode("utf-8", errors="replace")
     return string
 
 
@@ -141,7 +162,7 @@ def add_love(string: str, p: float = 0.1) -> str:
 
     .. _arXiv:1808.0911 : https://arxiv.org/abs/1808.09115
     """
-    if random.binomial(1, p):
+    if _RNG.random() < p:
         string = string + " love"
     return string
 
@@ -173,10 +194,36 @@ def add_backtranslation(string: str, p: float = 0.5) -> str:
     .. _arXiv:1904.12848 : https://arxiv.org/abs/1904.12848
 
     """
-    # the fairseq models do weird stuff with empty strings
     if not string:
         return string
-    if random.binomial(1, p):
-        t = _Translator()
-        string = t.backtranslate(string)
-    return string
+    return add_backtranslation_batch([string], p=p)[0]
+
+
+def add_backtranslation_batch(
+    strings: typing.Sequence[str], p: float = 0.5
+) -> typing.List[str]:
+    """Translate many sentences into another language and back.
+
+    Equivalent to calling ``add_backtranslation`` on each string, except that
+    the chosen strings are sent through the translation models together, which
+    makes much better use of the models (especially on a GPU).
+
+    Args:
+        strings: texts
+        p: probability of backtranslating each sentence
+
+    Returns:
+        enriched texts
+    """
+    strings = list(strings)
+    # the fairseq models do weird stuff with empty strings, so they are left
+    # alone without a draw, as add_backtranslation leaves them
+    nonempty = [index for index, string in enumerate(strings) if string]
+    flips = _RNG.random(len(nonempty)) < p
+    chosen = [index for index, flip in zip(nonempty, flips) if flip]
+    if chosen:
+        t = _Translator.instance()
+        translated = t.backtranslate_batch([strings[index] for index in chosen])
+        for index, string in zip(chosen, translated):
+            strings[index] = string
+    return strings
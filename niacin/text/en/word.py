@@ -7,68 +7,186 @@ Word-based functions for enriching English language data.
 Importable functions include:
 
 * add_hypernyms
+* add_hypernyms_batch
 * add_hyponyms
+* add_hyponyms_batch
 * add_misspelling
+* add_misspelling_batch
 * add_parens
+* add_parens_batch
 * add_synonyms
+* add_synonyms_batch
 * remove_articles
 * swap_words
 """
 
-import collections
-import json
-from pkg_resources import resource_string
+import functools
+import pkgutil
+import re
 import typing
 
-from scipy import random
-from nltk import wordnet
+import numpy as np
 
-
-HYPERNYMS = json.loads(resource_string("niacin", "data/hypernyms.json").decode("utf-8"))
-HYPONYMS = json.loads(resource_string("niacin", "data/hyponyms.json").decode("utf-8"))
-MISSPELLINGS = json.loads(
-    resource_string("niacin", "data/misspellings.json").decode("utf-8")
+from niacin._rng import (
+    RNG as _RNG,
+    sample_positions as _sample_positions,
+    swap_positions as _swap_positions,
 )
-SYNONYMS = json.loads(resource_string("niacin", "data/synonyms.json").decode("utf-8"))
+
+try:
+    # optional, but parses the word lists several times faster
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+
+# the word lists are large, so each one is only read the first time it is used
+_DATA = {
+    "HYPERNYMS": "hypernyms",
+    "HYPONYMS": "hyponyms",
+    "MISSPELLINGS": "misspellings",
+    "SYNONYMS": "synonyms",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name: str) -> typing.Dict[str, typing.List[str]]:
+    return _json.loads(pkgutil.get_data("niacin", f"data/{name}.json"))
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        return _load(_DATA[name])
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 ARTICLES = ("the", "a", "an", "these", "those", "his", "hers", "their")
+_ARTICLE_SET = frozenset(ARTICLES)
+# articles as whole whitespace-delimited words, as they are found by split
+# (re, not regex, agrees with str.split on what whitespace is; case classes
+# are explicit so unicode case folding cannot match more than str.lower would)
+P_ARTICLES = re.compile(
+    r"(?<!\S)(?:"
+    + "|".join(
+        "".join("[" + char + char.upper() + "]" for char in article)
+        for article in ARTICLES
+    )
+    + r")(?!\S)"
+)
+# anything that joining the split words with single spaces would change
+P_IRREGULAR_SPACE = re.compile(r"\A\s|\s\Z|\s\s|[^\S ]")
 
 
+@functools.lru_cache(maxsize=None)
 def _get_wordnet():
+    # nltk is slow to import, and only the lemmatizing functions need it
+    import nltk
+    from nltk import wordnet
+
     try:
         wn = wordnet.WordNetLemmatizer()
         wn.lemmatize("this is a test")
     except:
         print("Missing wordnet data -- attempting to download")
-        import nltk
-
         nltk.download("wordnet")
         wn = wordnet.WordNetLemmatizer()
     return wn
 
 
-def _sub_words(string: str, probability: float, mapping: typing.Mapping) -> str:
-    """Replace words with a given probability.
+@functools.lru_cache(maxsize=100_000)
+def _lemmatize(word: str) -> str:
+    return _get_wordnet().lemmatize(word)
 
-    Split a string into words (the naïve way, on whitespace). Then, search
-    word list for each key in the mapping, and replace it with its value with
-    some probability. Then join them back together with a single whitespace.
+
+def _lemma(word: str, mapping: typing.Mapping) -> str:
+    return word if word in mapping else _lemmatize(word)
+
+
+def _sub_lemmas(string: str, probability: float, mapping: typing.Mapping) -> str:
+    """Replace words with one of the options for their lemma, with some
+    probability.
+
+    Only the words that are picked for replacement get lemmatized, since
+    lemmatizing is by far the most expensive step, and words that are
+    already keys of the mapping are used as they are.
 
     Args:
         string: text
         probability: probability of replacing a word
-        mapping: map of substring -> replacement
+        mapping: map of lemma -> list of replacements
 
     Returns:
         enriched text
     """
     words = string.split()
-    for pattern, sub in mapping.items():
-        for index, word in enumerate(words):
-            if (word.lower() == pattern) and random.binomial(1, probability):
-                words[index] = sub
-    return " ".join(word for word in words if word)
+    positions = _sample_positions(len(words), probability)
+    return _replace_lemmas(string, words, positions, mapping)
+
+
+def _replace_lemmas(
+    string: str, words: typing.List[str], positions: np.ndarray, mapping: typing.Mapping
+) -> str:
+    lemmas = {index: _lemma(words[index], mapping) for index in positions}
+    hits = [index for index, lemma in lemmas.items() if lemma in mapping]
+    options = [mapping[lemmas[index]] for index in hits]
+    for index, choice in zip(hits, _choices(options)):
+        words[index] = choice
+    return _join(string, words, bool(hits))
+
+
+def _join(string: str, words: typing.List[str], changed: bool) -> str:
+    """Join words with single spaces, reusing the input when it would match.
+
+    Most calls with a small probability change nothing, and then the
+    input can be returned as it is, unless it has irregular whitespace.
+    """
+    if not changed and not P_IRREGULAR_SPACE.search(string):
+        return string
+    return " ".join(words)
+
+
+def _batch(
+    strings: typing.Iterable[str], p: float, replace: typing.Callable[..., str]
+) -> typing.List[str]:
+    """Enrich many strings, sampling word positions for all of them at once.
+
+    Every string is split into words, and the positions to change are drawn
+    with a single draw over all of the words, which is the same as drawing
+    them for each string in turn.
+
+    Args:
+        strings: texts
+        p: probability of changing a word
+        replace: function of (string, words, positions) -> enriched text
+
+    Returns:
+        enriched texts
+    """
+    strings = list(strings)
+    splits = [string.split() for string in strings]
+    lengths = np.fromiter(map(len, splits), dtype=np.intp, count=len(splits))
+    starts = np.cumsum(lengths) - lengths
+    positions = _sample_positions(int(lengths.sum()), p)
+    chunks = np.split(positions, np.searchsorted(positions, starts[1:]))
+    return [
+        replace(string, words, chunk - start)
+        for string, words, chunk, start in zip(strings, splits, chunks, starts)
+    ]
+
+
+def _choices(options: typing.Sequence[typing.Sequence[str]]) -> typing.List[str]:
+    """Pick one item from each sequence of options, using a single draw.
+
+    Indexing with integers avoids converting the options to arrays.
+    """
+    picks = _RNG.integers([len(option) for option in options])
+    return [option[pick] for option, pick in zip(options, picks)]
+
+
+def _lower(word: str) -> str:
+    # most words are already lowercase, and checking is cheaper than copying
+    return word if word.islower() else word.lower()
 
 
 def add_hypernyms(string: str, p: float = 0.01) -> str:
@@ -81,8 +199,7 @@ def add_hypernyms(string: str, p: float = 0.01) -> str:
     "all dogs go to heaven" -> "all quadrupeds go to place"
 
     The replacement words are drawn from wordnet (wordnet_). For
-    words with more than one possible replacement, one is selected using
-    ``random.choice``.
+    words with more than one possible replacement, one is selected at random.
 
     Args:
         string: text
@@ -93,13 +210,26 @@ def add_hypernyms(string: str, p: float = 0.01) -> str:
 
     .. _wordnet: https://wordnet.princeton.edu/
     """
-    wn = _get_wordnet()
-    words = string.split()
-    lemmas = [wn.lemmatize(w) for w in words]
-    for index, lemma in enumerate(lemmas):
-        if (lemma in HYPERNYMS) and random.binomial(1, p):
-            words[index] = random.choice(HYPERNYMS[lemma])
-    return " ".join(words)
+    return _sub_lemmas(string, probability=p, mapping=_load("hypernyms"))
+
+
+def add_hypernyms_batch(
+    strings: typing.Iterable[str], p: float = 0.01
+) -> typing.List[str]:
+    """Replace words in many strings with a higher-level category.
+
+    Equivalent to calling ``add_hypernyms`` on each string, except that the
+    words to change are drawn for all of the strings at once.
+
+    Args:
+        strings: texts
+        p: conditional probability of replacing a word
+
+    Returns:
+        enriched texts
+    """
+    mapping = _load("hypernyms")
+    return _batch(strings, p, functools.partial(_replace_lemmas, mapping=mapping))
 
 
 def add_hyponyms(string: str, p: float = 0.01) -> str:
@@ -112,8 +242,7 @@ def add_hyponyms(string: str, p: float = 0.01) -> str:
     "all dogs go to heaven" -> "all Australian shepherds go to heaven"
 
     The replacement words are drawn from wordnet (wordnet_). For
-    words with more than one possible replacement, one is selected using
-    ``random.choice``.
+    words with more than one possible replacement, one is selected at random.
 
     Args:
         string: text
@@ -124,13 +253,26 @@ def add_hyponyms(string: str, p: float = 0.01) -> str:
 
     .. _wordnet: https://wordnet.princeton.edu/
     """
-    wn = _get_wordnet()
-    words = string.split()
-    lemmas = [wn.lemmatize(w) for w in words]
-    for index, lemma in enumerate(lemmas):
-        if (lemma in HYPONYMS) and random.binomial(1, p):
-            words[index] = random.choice(HYPONYMS[lemma])
-    return " ".join(words)
+    return _sub_lemmas(string, probability=p, mapping=_load("hyponyms"))
+
+
+def add_hyponyms_batch(
+    strings: typing.Iterable[str], p: float = 0.01
+) -> typing.List[str]:
+    """Replace words in many strings with a lower-level category.
+
+    Equivalent to calling ``add_hyponyms`` on each string, except that the
+    words to change are drawn for all of the strings at once.
+
+    Args:
+        strings: texts
+        p: conditional probability of replacing a word
+
+    Returns:
+        enriched texts
+    """
+    mapping = _load("hyponyms")
+    return _batch(strings, p, functools.partial(_replace_lemmas, mapping=mapping))
 
 
 def add_misspelling(string: str, p: float = 0.1) -> str:
@@ -139,7 +281,7 @@ def add_misspelling(string: str, p: float = 0.1) -> str:
     Replaces a word with a common way that word is mispelled, given one or
     more known, common misspellings taken from the Wikipedia spelling
     correction corpus (wikipedia_). For words with more than one common
-    misspelling, one is chosen using ``random.choice``.
+    misspelling, one is chosen at random.
 
     Args:
         string: text
@@ -151,10 +293,34 @@ def add_misspelling(string: str, p: float = 0.1) -> str:
     .. _wikipedia: https://en.wikipedia.org/wiki/Wikipedia:Lists_of_common_misspellings
     """
     words = string.split()
-    for index, word in enumerate(words):
-        if (word in MISSPELLINGS) and random.binomial(1, p):
-            words[index] = random.choice(MISSPELLINGS[word])
-    return " ".join(words)
+    return _misspell(string, words, _sample_positions(len(words), p))
+
+
+def add_misspelling_batch(
+    strings: typing.Iterable[str], p: float = 0.1
+) -> typing.List[str]:
+    """Replace words in many strings with common misspellings.
+
+    Equivalent to calling ``add_misspelling`` on each string, except that the
+    words to change are drawn for all of the strings at once.
+
+    Args:
+        strings: texts
+        p: conditional probability of replacing a word
+
+    Returns:
+        enriched texts
+    """
+    return _batch(strings, p, _misspell)
+
+
+def _misspell(string: str, words: typing.List[str], positions: np.ndarray) -> str:
+    misspellings = _load("misspellings")
+    hits = [index for index in positions if words[index] in misspellings]
+    options = [misspellings[words[index]] for index in hits]
+    for index, choice in zip(hits, _choices(options)):
+        words[index] = choice
+    return _join(string, words, bool(hits))
 
 
 def add_parens(string: str, p: float = 0.01) -> str:
@@ -172,10 +338,31 @@ def add_parens(string: str, p: float = 0.01) -> str:
         enriched text
     """
     words = string.split()
-    for index, word in enumerate(words):
-        if random.binomial(1, p):
-            words[index] = "(((" + word + ")))"
-    return " ".join(words)
+    return _wrap_parens(string, words, _sample_positions(len(words), p))
+
+
+def add_parens_batch(
+    strings: typing.Iterable[str], p: float = 0.01
+) -> typing.List[str]:
+    """Wrap individual words in many strings in triple parentheses.
+
+    Equivalent to calling ``add_parens`` on each string, except that the
+    words to change are drawn for all of the strings at once.
+
+    Args:
+        strings: texts
+        p: probability of wrapping a word
+
+    Returns:
+        enriched texts
+    """
+    return _batch(strings, p, _wrap_parens)
+
+
+def _wrap_parens(string: str, words: typing.List[str], positions: np.ndarray) -> str:
+    for index in positions:
+        words[index] = f"((({words[index]})))"
+    return _join(string, words, len(positions) > 0)
 
 
 def add_synonyms(string: str, p: float = 0.01) -> str:
@@ -188,8 +375,7 @@ def add_synonyms(string: str, p: float = 0.01) -> str:
     "all dogs go to heaven" -> "all domestic dog depart to heaven"
 
     The replacement words are drawn from wordnet (wordnet_). For
-    words with more than one possible replacement, one is selected using
-    ``random.choice``.
+    words with more than one possible replacement, one is selected at random.
 
     Args:
         string: text
@@ -201,13 +387,26 @@ def add_synonyms(string: str, p: float = 0.01) -> str:
     .. _arxiv:1509.01626 : https://arxiv.org/abs/1509.01626
     .. _wordnet: https://wordnet.princeton.edu/
     """
-    wn = _get_wordnet()
-    words = string.split()
-    lemmas = [wn.lemmatize(w) for w in words]
-    for index, lemma in enumerate(lemmas):
-        if (lemma in SYNONYMS) and random.binomial(1, p):
-            words[index] = random.choice(SYNONYMS[lemma])
-    return " ".join(words)
+    return _sub_lemmas(string, probability=p, mapping=_load("synonyms"))
+
+
+def add_synonyms_batch(
+    strings: typing.Iterable[str], p: float = 0.01
+) -> typing.List[str]:
+    """Replace words in many strings with ones that have a close meaning.
+
+    Equivalent to calling ``add_synonyms`` on each string, except that the
+    words to change are drawn for all of the strings at once.
+
+    Args:
+        strings: texts
+        p: conditional probability of replacing a word
+
+    Returns:
+        enriched texts
+    """
+    mapping = _load("synonyms")
+    return _batch(strings, p, functools.partial(_replace_lemmas, mapping=mapping))
 
 
 def remove_articles(string: str, p: float = 1.0) -> str:
@@ -233,8 +432,17 @@ def remove_articles(string: str, p: float = 1.0) -> str:
     Returns:
         enriched text
     """
-    mapping = {article: "" for article in ARTICLES}
-    return _sub_words(string, probability=p, mapping=mapping)
+    if p >= 1.0:
+        return " ".join(P_ARTICLES.sub("", string).split())
+    words = string.split()
+    matches = [
+        index for index, word in enumerate(words) if _lower(word) in _ARTICLE_SET
+    ]
+    hits = _RNG.random(len(matches)) < p
+    removed = {index for index, hit in zip(matches, hits) if hit}
+    if not removed:
+        return _join(string, words, False)
+    return " ".join(word for index, word in enumerate(words) if index not in removed)
 
 
 def swap_words(string: str, p: float = 0.01) -> str:
@@ -261,11 +469,9 @@ def swap_words(string: str, p: float = 0.01) -> str:
     .. _eda : https://arxiv.org/abs/1901.11196
     """
     words = string.split()
-    index = 0
-    while index < len(words) - 1:
-        if random.binomial(1, p):
-            words[index], words[index + 1] = words[index + 1], words[index]
-            index += 2
-        else:
-            index += 1
-    return " ".join(words)
+    flips = np.zeros(max(len(words) - 1, 0), dtype=bool)
+    flips[_sample_positions(len(flips), p)] = True
+    swaps = _swap_positions(flips)
+    for index in swaps:
+        words[index], words[index + 1] = words[index + 1], words[index]
+    return _join(string, words, len(swaps) > 0)
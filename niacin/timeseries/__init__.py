@@ -15,8 +15,11 @@ Time domain
 -----------
 
 * add_slope_trend
+* add_slope_trend_batch
 * add_spike
+* add_spike_batch
 * add_step_trend
+* add_step_trend_batch
 * add_warp
 * crop_and_stretch
 * flip
@@ -35,4 +38,4 @@ Frequency domain
 """
 
 from .freq import (add_discrete_phase_shifts, add_high_frequency_noise, add_random_frequency_noise, remove_random_frequency)
-from .time import (add_slope_trend, add_spike, add_step_trend, add_warp, crop_and_stretch, flip, reverse)
\ No newline at end of file
+from .time import (add_slope_trend, add_slope_trend_batch, add_spike, add_spike_batch, add_step_trend, add_step_trend_batch, add_warp, crop_and_stretch, flip, reverse)
\ No newline at end of file
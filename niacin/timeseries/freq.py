@@ -2,12 +2,17 @@
 # -*- coding: utf-8
 
 """Frequency domain transforms
+
+Every transform returns as many entries as it was given. For odd lengths
+that means passing the length on to irfft, which would otherwise return one
+entry fewer.
 """
 
 import numpy as np
-from numpy import random
 from scipy.fft import irfft, rfft
 
+from niacin._rng import RNG as _RNG
+
 
 def add_discrete_phase_shifts(x: np.ndarray, p: float=0.01, m: float=0.1):
     r"""Shift each frequency component with probability p by distance m*len(x).
@@ -61,22 +66,22 @@ def add_discrete_phase_shifts(x: np.ndarray, p: float=0.01, m: float=0.1):
     """
     fx = rfft(x)
     step = round(len(fx) * m)
-    ps = random.binomial(1, p, len(fx))
-    signs = random.binomial(1, 0.5, len(fx)) * 2 - 1
-    # skip 0 Hz component
-    for i in range(1, len(fx)):
-        if ps[i] == 1:
-            j = min(max(i + signs[i] * step, 0), len(fx)-1)
-            if ps[j] == 1:
-                fx[i], fx[j] = fx[j], fx[i]
-                # don't shift the same component more than once
-                ps[i], ps[j] = -1, -1
-    return irfft(fx)
+    ps = (_RNG.random(len(fx)) < p).astype(np.int8)
+    signs = np.where(_RNG.random(len(fx)) < 0.5, 1, -1)
+    # skip 0 Hz component, and only visit the components drawn for shifting
+    idx = np.flatnonzero(ps[1:]) + 1
+    partners = np.clip(idx + signs[idx] * step, 0, len(fx)-1)
+    for i, j in zip(idx.tolist(), partners.tolist()):
+        if ps[i] == 1 and ps[j] == 1:
+            fx[i], fx[j] = fx[j], fx[i]
+            # don't shift the same component more than once
+            ps[i], ps[j] = -1, -1
+    return irfft(fx, len(x))
 
 
 def add_random_frequency_noise(x: np.ndarray, p: float=0.01, m: float=0.1):
     r"""Add gaussian noise to each frequency with probability p and magnitude
-    N(0,1) * m * max(fft(x))
+    N(0,1) * m * max(abs(fft(x)))
 
     Args:
         x: sequence
@@ -121,15 +126,16 @@ def add_random_frequency_noise(x: np.ndarray, p: float=0.01, m: float=0.1):
         |
     """
     fx = rfft(x)
-    ps = random.binomial(1, p, len(fx))
-    noise = random.randn(2*len(fx)).view(np.complex128) * m * fx.max()
-    fx[1:] = fx[1:] + ps[1:] * noise[1:]
-    return irfft(fx)
+    # skip 0 Hz component, and only draw noise for the chosen components
+    idx = np.flatnonzero(_RNG.random(len(fx) - 1) < p) + 1
+    noise = _RNG.standard_normal(2*len(idx)).view(np.complex128) * m * np.abs(fx).max()
+    fx[idx] += noise
+    return irfft(fx, len(x))
 
 
 def add_high_frequency_noise(x: np.ndarray, p: float=0.01, m: float=0.1):
     r"""Add gaussian noise to single highest frequency component with
-    probability p and magnitude N(0,1) * m * max(fft(x))
+    probability p and magnitude N(0,1) * m * max(abs(fft(x)))
 
     Args:
         x: sequence
@@ -173,11 +179,26 @@ def add_high_frequency_noise(x: np.ndarray, p: float=0.01, m: float=0.1):
         -2.11065    || ||             ||||               ||||
         |
     """
-    fx = rfft(x)
-    if random.binomial(1, p):
-        noise = random.randn(2).view(np.complex128) * m * fx.max()
-        fx[-1] = fx[-1] + noise
-    return irfft(fx)
+    x = np.asarray(x)
+    # match the dtype irfft would return: single precision stays single
+    if np.issubdtype(x.dtype, np.floating):
+        out = x.astype(np.result_type(x.dtype, np.float32))
+    else:
+        out = x.astype(np.float64)
+    if not _RNG.random() < p:
+        return out
+    noise = complex(*_RNG.standard_normal(2)) * m * np.abs(rfft(x)).max()
+    # adding noise to the last rfft component only adds one sinusoid in the
+    # time domain, so there is no need to transform the spectrum back
+    n = len(x)
+    if n % 2:
+        angle = 2 * np.pi * (n // 2) / n * np.arange(n)
+        out += 2 / n * (noise.real * np.cos(angle) - noise.imag * np.sin(angle))
+    else:
+        # the Nyquist component is real, and alternates in sign
+        out[0::2] += noise.real / n
+        out[1::2] -= noise.real / n
+    return out
 
 
 def remove_random_frequency(x: np.ndarray, p: float=0.01, m=None):
@@ -225,6 +246,6 @@ def remove_random_frequency(x: np.ndarray, p: float=0.01, m=None):
         -1
     """
     fx = rfft(x)
-    ps = random.binomial(1, 1-p, len(fx))
-    fx = fx * ps
-    return irfft(fx)
\ No newline at end of file
+    # rfft returns a fresh array, so zero the removed components in place
+    fx[_RNG.random(len(fx)) < p] = 0
+    return irfft(fx, len(x))
\ No newline at end of file
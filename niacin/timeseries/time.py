@@ -2,16 +2,144 @@
 # -*- coding: utf-8
 
 """Time domain transforms
+
+Floating point and complex sequences keep their dtype (e.g. float32 in,
+float32 out), so that the intermediate arrays are no larger than they need to
+be. Other sequences come back as float64 from the transforms that compute new
+values.
 """
 
 
+import functools
+
 import numpy as np
-from numpy import random
 from scipy import interpolate
 
+from niacin._rng import RNG as _RNG
+
+
+def _dtype(x: np.ndarray) -> np.dtype:
+    # complex sequences stay complex, as the real-valued trends add to them
+    dtype = np.asarray(x).dtype
+    return dtype if dtype.kind in 'fc' else np.dtype(np.float64)
+
+
+def _uniform(shape, dtype: np.dtype) -> np.ndarray:
+    # the generator only draws float32 and float64
+    return _RNG.random(shape, dtype=np.float32 if dtype == np.float32 else np.float64)
+
+
+@functools.lru_cache(maxsize=64)
+def _ramp(n: int, dtype: np.dtype) -> np.ndarray:
+    # sequences are usually windows of a few fixed lengths, so the grids are
+    # cached, and read-only so that a caller cannot change them for the others
+    ramp = np.linspace(0, 1, n, dtype=dtype)
+    ramp.setflags(write=False)
+    return ramp
+
+
+@functools.lru_cache(maxsize=64)
+def _index(n: int) -> np.ndarray:
+    index = np.arange(n)
+    index.setflags(write=False)
+    return index
+
+
+def _add(x: np.ndarray, delta: np.ndarray, inplace: bool) -> np.ndarray:
+    # delta is always a fresh array of the result's shape and dtype, so the
+    # sum can reuse its memory when x is not to be changed
+    if inplace:
+        return np.add(x, delta, out=x)
+    delta += x
+    return delta
+
+
+def _spikes(u: np.ndarray, p: float, spike) -> np.ndarray:
+    # signed spikes where u < p, zero elsewhere; masking one signed array in
+    # place saves the second full-size temporary of a nested np.where
+    spikes = np.where(u < p / 2, -spike, spike)
+    np.copyto(spikes, 0, where=u >= p)
+    return spikes
+
+
+def _applies(p: float) -> bool:
+    # a certain outcome needs no draw
+    if p <= 0.0:
+        return False
+    if p >= 1.0:
+        return True
+    return _RNG.random() < p
+
+
+def _std(x: np.ndarray, **kwargs) -> np.ndarray:
+    # nanstd is several times slower than std, and most data has no NaNs,
+    # which std signals by not returning NaN
+    s = np.std(x, **kwargs)
+    if np.isnan(s).any():
+        return np.nanstd(x, **kwargs)
+    return s
+
 
+def _linear(x: np.ndarray, num: np.ndarray, den: int) -> np.ndarray:
+    return np.interp(num / den, _index(len(x)), x)
 
-def add_slope_trend(x: np.ndarray, p: float=0.01, m: float=0.1) -> np.ndarray:
+
+def _previous(x: np.ndarray, num: np.ndarray, den: int) -> np.ndarray:
+    return x[num // den]
+
+
+def _next(x: np.ndarray, num: np.ndarray, den: int) -> np.ndarray:
+    return x[-(-num // den)]
+
+
+def _nearest(x: np.ndarray, num: np.ndarray, den: int) -> np.ndarray:
+    # halfway between two samples goes to the lower one, as in interp1d
+    return x[-((den - 2 * num) // (2 * den))]
+
+
+def _nearest_up(x: np.ndarray, num: np.ndarray, den: int) -> np.ndarray:
+    return x[(2 * num + den) // (2 * den)]
+
+
+def _spline(k: int):
+    def spline(x: np.ndarray, num: np.ndarray, den: int) -> np.ndarray:
+        if len(x) <= k:
+            raise ValueError(f"Spline of order {k} needs at least {k+1} samples")
+        return interpolate.make_interp_spline(np.arange(len(x)), x, k=k)(num / den)
+    return spline
+
+
+# the interp1d kinds, each taking (x, num, den) for the positions num/den
+_INTERPOLATORS = {
+    'linear': _linear,
+    'nearest': _nearest,
+    'nearest-up': _nearest_up,
+    'zero': _previous,
+    'slinear': _spline(1),
+    'quadratic': _spline(2),
+    'cubic': _spline(3),
+    'previous': _previous,
+    'next': _next,
+}
+
+
+def _interpolate(x: np.ndarray, num: np.ndarray, den: int, kind: str) -> np.ndarray:
+    """Interpolate x, sampled at 0, 1, ..., len(x)-1, at the positions num/den.
+
+    The positions are integer fractions, so that the step-like kinds can pick
+    their samples with exact integer arithmetic, instead of building an
+    interp1d to search for them.
+    """
+    try:
+        interpolator = _INTERPOLATORS[kind]
+    except KeyError:
+        msg = f"Unknown interp_method={kind!r}, expected one of {list(_INTERPOLATORS)}"
+        raise ValueError(msg) from None
+    x = np.asarray(x)
+    return interpolator(x, num, den).astype(_dtype(x), copy=False)
+
+
+def add_slope_trend(x: np.ndarray, p: float=0.01, m: float=0.1, inplace: bool = False) -> np.ndarray:
     r"""Add linear trend, with probability p, and magnitude m*std(x).
 
     The probability refers to the entire trend -- either it is added, or the
@@ -22,6 +150,7 @@ def add_slope_trend(x: np.ndarray, p: float=0.01, m: float=0.1) -> np.ndarray:
         x: sequence
         p: per-sequence probability of applying trend
         m: magnitude of trend
+        inplace: add to x itself (a floating point array) instead of a copy
 
     Returns:
         enriched sequence
@@ -60,14 +189,46 @@ def add_slope_trend(x: np.ndarray, p: float=0.01, m: float=0.1) -> np.ndarray:
         -0.82       \--/
         |
     """
-    if random.binomial(1, p):
-        s = np.nanstd(x)
-        sign = (random.binomial(1, 0.5, 1) * 2 - 1).item()
-        x = x + np.linspace(0, sign*m*s, len(x))
-    return x
+    if m == 0 or not _applies(p):
+        return x
+    end = m * _std(x)
+    if _RNG.random() < 0.5:
+        end = -end
+    return _add(x, _ramp(len(x), _dtype(x)) * end, inplace)
 
 
-def add_spike(x: np.ndarray, p: float=0.01, m: float=1.0) -> np.ndarray:
+def add_slope_trend_batch(X: np.ndarray, p: float=0.01, m: float=0.1, inplace: bool = False) -> np.ndarray:
+    r"""Add linear trends to many sequences, each with probability p, and
+    magnitude m*std(x).
+
+    Equivalent to calling ``add_slope_trend`` on each row of X, with the random draws
+    for every row made at once.
+
+    Args:
+        X: sequences, one per row
+        p: per-sequence probability of applying trend
+        m: magnitude of trend
+        inplace: add to X itself (a floating point array) instead of a copy
+
+    Returns:
+        enriched sequences
+
+    Examples:
+        >>> X = np.sin(np.linspace(0, 6*np.pi, 100)) * np.ones((8, 1))
+        >>> ts.add_slope_trend_batch(X, 1.0, 1.0)
+    """
+    X = np.asarray(X)
+    if p <= 0 or m == 0:
+        return X
+    dtype = _dtype(X)
+    s = _std(X, axis=1, keepdims=True)
+    applied = _RNG.random((len(X), 1)) < p
+    signs = np.where(_RNG.random((len(X), 1)) < 0.5, 1, -1)
+    ends = (applied * signs * m * s).astype(dtype)
+    return _add(X, ends * _ramp(X.shape[1], dtype), inplace)
+
+
+def add_spike(x: np.ndarray, p: float=0.01, m: float=1.0, inplace: bool = False) -> np.ndarray:
     r"""At each array entry, add a spike with probability p and magnitude
     m*std(x).
 
@@ -78,6 +239,7 @@ def add_spike(x: np.ndarray, p: float=0.01, m: float=1.0) -> np.ndarray:
         x: sequence
         p: per-entry probability of adding spike
         m: magnitude of spike
+        inplace: add to x itself (a floating point array) instead of a copy
 
     Returns:
         enriched sequence
@@ -116,14 +278,49 @@ def add_spike(x: np.ndarray, p: float=0.01, m: float=1.0) -> np.ndarray:
         -1.64856                      ||                 |
         |
     """
-    s = np.nanstd(x)
-    ps = random.binomial(1, p, len(x))
-    signs = random.binomial(1, 0.5, len(x)) * 2 - 1
-    x = x + ps * signs * (m * s)
-    return x
+    if p <= 0 or m == 0:
+        return x
+    dtype = _dtype(x)
+    spike = dtype.type(m * _std(x))
+    # one uniform draw decides both whether there is a spike, and its sign
+    u = _uniform(len(x), dtype)
+    if p >= 1:
+        spikes = np.where(u < 0.5, -spike, spike)
+    else:
+        spikes = _spikes(u, p, spike)
+    return _add(x, spikes, inplace)
+
+
+def add_spike_batch(X: np.ndarray, p: float=0.01, m: float=1.0, inplace: bool = False) -> np.ndarray:
+    r"""At each entry of many sequences, add a spike with probability p and
+    magnitude m*std(x).
+
+    Equivalent to calling ``add_spike`` on each row of X, with the random draws
+    for every row made at once.
+
+    Args:
+        X: sequences, one per row
+        p: per-entry probability of adding spike
+        m: magnitude of spike
+        inplace: add to X itself (a floating point array) instead of a copy
+
+    Returns:
+        enriched sequences
+
+    Examples:
+        >>> X = np.sin(np.linspace(0, 6*np.pi, 100)) * np.ones((8, 1))
+        >>> ts.add_spike_batch(X, 0.1, 1.0)
+    """
+    X = np.asarray(X)
+    if p <= 0 or m == 0:
+        return X
+    dtype = _dtype(X)
+    spike = (m * _std(X, axis=1, keepdims=True)).astype(dtype)
+    u = _uniform(X.shape, dtype)
+    return _add(X, _spikes(u, p, spike), inplace)
 
 
-def add_step_trend(x: np.ndarray, p: float=0.01, m: float=0.1) -> np.ndarray:
+def add_step_trend(x: np.ndarray, p: float=0.01, m: float=0.1, inplace: bool = False) -> np.ndarray:
     r"""Add a stepwise trend, where each entry in the timeseries has p
     probability of a stepwise change of magnitude m*std(x).
 
@@ -135,6 +332,7 @@ def add_step_trend(x: np.ndarray, p: float=0.01, m: float=0.1) -> np.ndarray:
         x: sequence
         p: per-entry probability of step change
         m: magnitude of step change
+        inplace: add to x itself (a floating point array) instead of a copy
 
     Returns:
         enriched sequence
@@ -173,11 +371,49 @@ def add_step_trend(x: np.ndarray, p: float=0.01, m: float=0.1) -> np.ndarray:
         -3.02032                                           ////
         |
     """
-    s = np.nanstd(x)
-    sign = (random.binomial(1, 0.5, 1) * 2 - 1).item()
-    ps = random.binomial(1, p, len(x))
-    x = x + np.cumsum(ps * (sign * m * s))
-    return x
+    if p <= 0 or m == 0:
+        return x
+    s = _std(x)
+    sign = 1 if _RNG.random() < 0.5 else -1
+    if p >= 1:
+        steps = np.arange(1, len(x) + 1, dtype=_dtype(x))
+    else:
+        # count the steps, then scale them once
+        steps = np.cumsum(_RNG.random(len(x)) < p, dtype=_dtype(x))
+    steps *= float(sign * m * s)
+    return _add(x, steps, inplace)
+
+
+def add_step_trend_batch(X: np.ndarray, p: float=0.01, m: float=0.1, inplace: bool = False) -> np.ndarray:
+    r"""Add stepwise trends to many sequences, where each entry has p
+    probability of a stepwise change of magnitude m*std(x).
+
+    Equivalent to calling ``add_step_trend`` on each row of X, with the random draws
+    for every row made at once.
+
+    Args:
+        X: sequences, one per row
+        p: per-entry probability of step change
+        m: magnitude of step change
+        inplace: add to X itself (a floating point array) instead of a copy
+
+    Returns:
+        enriched sequences
+
+    Examples:
+        >>> X = np.sin(np.linspace(0, 6*np.pi, 100)) * np.ones((8, 1))
+        >>> ts.add_step_trend_batch(X, 0.05, 0.5)
+    """
+    X = np.asarray(X)
+    if p <= 0 or m == 0:
+        return X
+    dtype = _dtype(X)
+    s = _std(X, axis=1, keepdims=True)
+    signs = np.where(_RNG.random((len(X), 1)) < 0.5, 1, -1)
+    ps = _RNG.random(X.shape) < p
+    steps = np.cumsum(ps, axis=1, dtype=dtype)
+    steps *= (signs * m * s).astype(dtype)
+    return _add(X, steps, inplace)
 
 
 def add_warp(x: np.ndarray, p: float=0.01, m: float=0.1, interp_method: str = 'linear') -> np.ndarray:
@@ -238,13 +474,14 @@ def add_warp(x: np.ndarray, p: float=0.01, m: float=0.1, interp_method: str = 'l
     if step < 2:
         # can't warp with no extra space
         return x
-    if random.binomial(1, p):
+    if _applies(p):
         stretch_size = old_size * step
-        old_t = np.linspace(0, 1, old_size)
-        stretch_t = np.linspace(0, 1, stretch_size)
-        select = np.sort(random.choice(stretch_t, size=old_size, replace=False))
-        f = interpolate.interp1d(old_t, x, kind=interp_method)
-        x = f(select)
+        # pick points of the upsampled grid by index, without building the grid;
+        # the picks are sorted anyway, so skip choice's final shuffle
+        picks = np.sort(
+            _RNG.choice(stretch_size, size=old_size, replace=False, shuffle=False)
+        )
+        x = _interpolate(x, picks * (old_size-1), stretch_size-1, interp_method)
     return x
 
 
@@ -308,23 +545,22 @@ def crop_and_stretch(x: np.ndarray,  p: float=0.01, m: float=0.1, interp_method:
         # if m << there might be no crop
         # if m >> the crop might be equal to length of sequence
         return x
-    if random.binomial(1, p):
-        start = random.randint(0, old_size-crop_size, 1).item()
+    if _applies(p):
+        start = _RNG.integers(old_size-crop_size)
         crop = x[start:start+crop_size]
-        crop_t = np.linspace(0, 1, crop_size)
-        new_t = np.linspace(0, 1, old_size)
-        f = interpolate.interp1d(crop_t, crop, kind=interp_method)
-        x = f(new_t)
+        new_t = np.arange(old_size) * (crop_size-1)
+        x = _interpolate(crop, new_t, old_size-1, interp_method)
     return x
 
 
-def flip(x: np.ndarray, p: float=0.5, m=None) -> np.ndarray:
+def flip(x: np.ndarray, p: float=0.5, m=None, inplace: bool = False) -> np.ndarray:
     r"""Flip sequence around origin with probability p.
 
     Args:
         x: sequence
         p: per-sequence probability of flipping
         m: ignored
+        inplace: flip x itself instead of returning a flipped copy
 
     Returns:
         enriched sequence
@@ -363,18 +599,22 @@ def flip(x: np.ndarray, p: float=0.5, m=None) -> np.ndarray:
         -1  -//               -//               --/
         |
     """
-    if random.binomial(1, p):
-        x = -x
+    if _applies(p):
+        x = np.negative(x, out=x) if inplace else -x
     return x
 
 
-def reverse(x: np.ndarray, p: float=0.5, m=None) -> np.ndarray:
+def reverse(x: np.ndarray, p: float=0.5, m=None, inplace: bool = False) -> np.ndarray:
     r"""Reverse order of sequence with probability p
 
+    Without inplace, the reversed sequence is a view of x, with a negative
+    stride.
+
     Args:
         x: sequence
         p: per-sequence probability of reversal
         m: ignored
+        inplace: reverse the entries of x itself, so the result stays contiguous
 
     Returns:
         enriched sequence
@@ -412,6 +652,10 @@ def reverse(x: np.ndarray, p: float=0.5, m=None) -> np.ndarray:
         |  \  //             \  //             \   /
         -1  -//               -//               --/
     """
-    if random.binomial(1, p):
-        x = x[::-1]
+    if _applies(p):
+        if inplace:
+            # numpy copies the overlapping view before writing
+            x[:] = x[::-1]
+        else:
+            x = x[::-1]
     return x
\ No newline at end of file
@@ -26,7 +26,7 @@ setup(
     package_data={
         'niacin': ['data/*', 'py.typed']
     },
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=install_requirements,
     extras_require=extras,
     long_description=desc,
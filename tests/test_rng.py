@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import niacin
+from niacin import _rng
+
+
+def test_seed():
+    niacin.seed(42)
+    first = _rng.RNG.random(5)
+    niacin.seed(42)
+    second = _rng.RNG.random(5)
+    assert np.array_equal(first, second)
+
+
+@pytest.mark.parametrize("n,p,exp", [(0, 0.5, 0), (10, 0.0, 0), (10, 1.0, 10)])
+def test_sample_positions(n, p, exp):
+    res = _rng.sample_positions(n, p)
+    assert len(res) == exp
+    assert np.all(np.diff(res) > 0)
+    assert np.all((res >= 0) & (res < max(n, 1)))
+
+
+@pytest.mark.parametrize(
+    "flips,exp",
+    [
+        ([], []),
+        ([False, True, False], [1]),
+        ([True, True, True, False, True], [0, 2, 4]),
+        ([True, True, True, True], [0, 2]),
+    ],
+)
+def test_swap_positions(flips, exp):
+    res = _rng.swap_positions(np.array(flips, dtype=bool))
+    assert res.tolist() == exp
+
+
+def test_spawn():
+    niacin.seed(42)
+    first = [np.random.default_rng(s).random() for s in _rng.spawn(2)]
+    niacin.seed(42)
+    second = [np.random.default_rng(s).random() for s in _rng.spawn(2)]
+    assert first == second
+    assert first[0] != first[1]
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+
+import pytest
+
+import niacin
+from niacin.text import batch
+from niacin.text.en import char
+
+
+@pytest.mark.parametrize("processes", [False, True])
+@pytest.mark.parametrize(
+    "strings,p,exp",
+    [
+        ([], 1.0, []),
+        (["dog", "", "cat"], 0.0, ["dog", "", "cat"]),
+        (["dog", "", "cat"], 1.0, [" d o g ", " ", " c a t "]),
+    ],
+)
+def test_apply(strings, p, exp, processes):
+    res = batch.apply(char.add_whitespace, strings, n_jobs=2, processes=processes, p=p)
+    assert res == exp
+
+
+def test_apply_processes_seeded():
+    strings = ["the quick brown fox"] * 20
+    niacin.seed(42)
+    first = batch.apply(char.swap_chars, strings, n_jobs=2, processes=True, p=0.5)
+    niacin.seed(42)
+    second = batch.apply(char.swap_chars, strings, n_jobs=2, processes=True, p=0.5)
+    assert first == second
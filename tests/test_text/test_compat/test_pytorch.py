@@ -3,14 +3,13 @@
 
 
 from functools import partial
-import os
 import pytest
-import tempfile
+import threading
 
 from nltk import WordPunctTokenizer
-import pandas as pd
-import torch
-from torchtext.vocab import Vocab
+
+torch = pytest.importorskip("torch")
+Vocab = pytest.importorskip("torchtext.vocab").Vocab
 
 from niacin.text.compat.pytorch import (
     MemoryTextDataset,
@@ -20,44 +19,34 @@ from niacin.text.compat.pytorch import (
 from niacin.text.en import char
 
 
-def simple_file():
-    data = pd.DataFrame({"labels": [0], "data": ["this is a test!"]})
-    return data
+TOKENIZER = WordPunctTokenizer().tokenize
+VOCAB = Vocab({"this": 1, "<unk>": 1, "<pad>": 1})
+# "this is a test!" indexed by the default vocab, and by VOCAB
+EXPECTED = torch.tensor([6, 4, 3, 5, 2])
+EXPECTED_VOCAB = torch.tensor([2, 0, 0, 0, 0])
 
 
-@pytest.fixture
-def temp_csv_file():
-    data = simple_file()
-    f = tempfile.NamedTemporaryFile(suffix=".csv", mode="w+")
-    fp = f.name
-    data.to_csv(fp, index=False)
-    yield fp
-    f.close()
+@pytest.fixture(scope="module")
+def temp_csv_file(tmp_path_factory):
+    fp = tmp_path_factory.mktemp("csv") / "data.csv"
+    fp.write_text("labels,data\n0,this is a test!\n")
+    return str(fp)
 
 
-@pytest.fixture
-def temp_tsv_file():
-    data = simple_file()
-    f = tempfile.NamedTemporaryFile(suffix=".tsv", mode="w+")
-    fp = f.name
-    data.to_csv(fp, sep="\t", index=False)
-    yield fp
-    f.close()
+@pytest.fixture(scope="module")
+def temp_tsv_file(tmp_path_factory):
+    fp = tmp_path_factory.mktemp("tsv") / "data.tsv"
+    fp.write_text("labels\tdata\n0\tthis is a test!\n")
+    return str(fp)
 
 
-@pytest.fixture
-def temp_dir_with_files():
-    data = simple_file()
-    data_dir = tempfile.TemporaryDirectory()
-    label_dir = tempfile.TemporaryDirectory()
-    for index, row in data.iterrows():
-        with open(os.path.join(data_dir.name, str(index) + ".txt"), "w") as f:
-            f.write(row.iloc[1:].str.cat(sep=" "))
-        with open(os.path.join(label_dir.name, str(index) + ".txt"), "w") as f:
-            f.write(str(row.iloc[0]))
-    yield data_dir.name, label_dir.name
-    data_dir.cleanup()
-    label_dir.cleanup()
+@pytest.fixture(scope="module")
+def temp_dir_with_files(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("data")
+    label_dir = tmp_path_factory.mktemp("labels")
+    (data_dir / "0.txt").write_text("this is a test!")
+    (label_dir / "0.txt").write_text("0")
+    return str(data_dir), str(label_dir)
 
 
 class TestMemoryTextDataset:
@@ -105,7 +94,7 @@ class TestMemoryTextDataset:
             (
                 ["this is a test!"],
                 [0],
-                WordPunctTokenizer().tokenize,
+                TOKENIZER,
                 ["this", "is", "a", "test", "!"],
             ),
         ],
@@ -118,12 +107,12 @@ class TestMemoryTextDataset:
     @pytest.mark.parametrize(
         "data,labels,vocab,expected",
         [
-            (["this is a test!"], [0], None, torch.tensor([6, 4, 3, 5, 2])),
+            (["this is a test!"], [0], None, EXPECTED),
             (
                 ["this is a test!"],
                 [0],
-                Vocab({"this": 1, "<unk>": 1, "<pad>": 1}),
-                torch.tensor([2, 0, 0, 0, 0]),
+                VOCAB,
+                EXPECTED_VOCAB,
             ),
         ],
     )
@@ -132,6 +121,37 @@ class TestMemoryTextDataset:
         result, _ = dataset[0]
         assert torch.equal(result, expected)
 
+    def test_cache(self):
+        data, labels = ["this is a test!"], [0]
+        dataset = MemoryTextDataset(data, labels)
+        item, _ = dataset[0]
+        item[0] = -1
+        item.add_(1)
+        assert torch.equal(dataset[0][0], EXPECTED)
+        padded, _ = dataset.get_batch([0])
+        padded.zero_()
+        assert torch.equal(dataset[0][0], EXPECTED)
+        transforms = [partial(char.remove_whitespace, p=1.0)]
+        dataset = MemoryTextDataset(data, labels, transforms=transforms)
+        assert torch.equal(dataset[0][0], torch.tensor([0, 2]))
+
+    @pytest.mark.parametrize("transforms", [None, [partial(char.add_whitespace, p=0.0)]])
+    def test_get_batch(self, transforms):
+        data, labels = ["this is a test!", "a test"], [0, 1]
+        dataset = MemoryTextDataset(data, labels, transforms=transforms)
+        result, result_labels = dataset.get_batch([0, 1])
+        assert torch.equal(result, torch.tensor([[6, 5, 2, 3, 4], [2, 3, 1, 1, 1]]))
+        assert torch.equal(result_labels, torch.tensor([0, 1]))
+
+    def test_get_batch_string_labels(self):
+        data, labels = ["this is a test!", "a test"], ["spam", "ham"]
+        dataset = MemoryTextDataset(data, labels)
+        _, label = dataset[1]
+        result, result_labels = dataset.get_batch([1, 0])
+        assert label == "ham"
+        assert result.shape == (2, 5)
+        assert result_labels == ["ham", "spam"]
+
 
 class TestFileTextDataset:
     def test_indexing(self, temp_csv_file, temp_tsv_file):
@@ -170,7 +190,7 @@ class TestFileTextDataset:
             (
                 temp_tsv_file,
                 "\t",
-                WordPunctTokenizer().tokenize,
+                TOKENIZER,
                 ["this", "is", "a", "test", "!"],
             ),
         ]
@@ -181,12 +201,12 @@ class TestFileTextDataset:
 
     def test_getitem(self, temp_csv_file, temp_tsv_file):
         parameters = [
-            (temp_csv_file, ",", None, torch.tensor([6, 4, 3, 5, 2])),
+            (temp_csv_file, ",", None, EXPECTED),
             (
                 temp_tsv_file,
                 "\t",
-                Vocab({"this": 1, "<unk>": 1, "<pad>": 1}),
-                torch.tensor([2, 0, 0, 0, 0]),
+                VOCAB,
+                EXPECTED_VOCAB,
             ),
         ]
         for fp, sep, vocab, expected in parameters:
@@ -195,6 +215,14 @@ class TestFileTextDataset:
             assert torch.equal(result, expected)
 
 
+    def test_missing_cells(self, tmp_path):
+        fp = tmp_path / "missing.csv"
+        fp.write_text("labels,a,b,c\n0,this is,,a test!\n1,,,a test\n")
+        dataset = FileTextDataset(str(fp), tokenizer=lambda text: text.split(" "))
+        assert dataset._data == ["this is a test!", "a test"]
+        assert dataset._tokenize(dataset._data[1]) == ["a", "test"]
+
+
 class TestDirectoryTextDataset:
     def test_indexing(self, temp_dir_with_files):
         data_dir, labels_dir = temp_dir_with_files
@@ -204,6 +232,26 @@ class TestDirectoryTextDataset:
             assert len(dataset) == l
             assert dataset[i] is not None
 
+    def test_build_vocab_tokenizes_on_caller(self, tmp_path):
+        data_dir, labels_dir = tmp_path / "data", tmp_path / "labels"
+        data_dir.mkdir()
+        labels_dir.mkdir()
+        for index in range(40):
+            (data_dir / f"{index}.txt").write_text(f"word{index} shared")
+            (labels_dir / f"{index}.txt").write_text("0")
+        threads = set()
+
+        def tokenizer(text):
+            threads.add(threading.get_ident())
+            return text.split()
+
+        dataset = DirectoryTextDataset(
+            str(data_dir), str(labels_dir), tokenizer=tokenizer
+        )
+        assert threads == {threading.get_ident()}
+        assert dataset._vocab.freqs["shared"] == 40
+        assert dataset._vocab.freqs["word39"] == 1
+
     def test_transforms(self, temp_dir_with_files):
         data_dir, labels_dir = temp_dir_with_files
         parameters = [
@@ -235,7 +283,7 @@ class TestDirectoryTextDataset:
             (
                 data_dir,
                 labels_dir,
-                WordPunctTokenizer().tokenize,
+                TOKENIZER,
                 ["this", "is", "a", "test", "!"],
             ),
         ]
@@ -247,12 +295,12 @@ class TestDirectoryTextDataset:
     def test_getitem(self, temp_dir_with_files):
         data_dir, labels_dir = temp_dir_with_files
         parameters = [
-            (data_dir, labels_dir, None, torch.tensor([6, 4, 3, 5, 2])),
+            (data_dir, labels_dir, None, EXPECTED),
             (
                 data_dir,
                 labels_dir,
-                Vocab({"this": 1, "<unk>": 1, "<pad>": 1}),
-                torch.tensor([2, 0, 0, 0, 0]),
+                VOCAB,
+                EXPECTED_VOCAB,
             ),
         ]
         for data, labels, vocab, expected in parameters:
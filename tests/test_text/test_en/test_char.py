@@ -2,9 +2,11 @@
 # -*- encoding: utf-8 -*-
 
 
+import numpy as np
 import pytest
 from unittest.mock import patch
 
+import niacin
 from niacin.text.en import char
 
 
@@ -126,7 +128,8 @@ def test_add_whitespace(string, p, exp):
     ],
 )
 def test_add_macbook_keyboard(string, p, choice, exp):
-    with patch('niacin.text.en.char.random.choice', return_value=choice) as mock:
+    with patch('niacin.text.en.char._RNG', wraps=char._RNG) as mock:
+        mock.integers.side_effect = lambda high, size: np.full(size, choice // 2)
         res = char.add_macbook_keyboard(string, p)
         assert res == exp
 
@@ -142,4 +145,40 @@ def test_add_macbook_keyboard(string, p, choice, exp):
 )
 def test_swap_chars(string, p, exp):
     res = char.swap_chars(string, p)
-    assert res == exp
\ No newline at end of file
+    assert res == exp
+
+
+@pytest.mark.parametrize(
+    "fn",
+    [
+        char.add_fat_thumbs,
+        char.add_macbook_keyboard,
+        char.remove_characters,
+        char.swap_chars,
+    ],
+)
+def test_lone_surrogates(fn):
+    string = "caf\udcc3\udca9 bar"
+    assert fn(string, 0.0) == string
+
+
+def test_lone_surrogates_kept():
+    string = "caf\udcc3\udca9 bar"
+    # surrogates have no keyboard neighbors, so they stay where they are
+    res = char.add_fat_thumbs(string, 1.0)
+    assert len(res) == len(string)
+    assert res[3:5] == "\udcc3\udca9"
+    assert char.swap_chars(string, 1.0) == "ac\udcc3f \udca9abr"
+    with patch('niacin.text.en.char._RNG', wraps=char._RNG) as mock:
+        mock.integers.side_effect = lambda high, size: np.full(size, 1)
+        res = char.add_macbook_keyboard(string, 1.0)
+        assert res == "ccaaff\udcc3\udcc3\udca9\udca9  bbaarr"
+    # the removed positions depend only on the length, so a placeholder of the
+    # same length shows which characters should be kept
+    placeholder = "abcdefghi"
+    niacin.seed(0)
+    kept = char.remove_characters(placeholder, 0.5)
+    niacin.seed(0)
+    res = char.remove_characters(string, 0.5)
+    assert res == "".join(string[placeholder.index(c)] for c in kept)
+    assert "\udcc3\udca9" in res
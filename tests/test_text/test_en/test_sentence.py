@@ -4,9 +4,18 @@
 
 import pytest
 
+import niacin
+from niacin import _rng
 from niacin.text.en import sentence
 
 
+@pytest.fixture(scope="session")
+def translator():
+    # load the translation models once, before the first backtranslation test
+    pytest.importorskip("torch")
+    return sentence._Translator.instance()
+
+
 @pytest.mark.parametrize(
     "string,p,exp",
     [
@@ -47,6 +56,7 @@ def test_add_bytes(string, p, length, exp):
 
 
 @pytest.mark.slow
+@pytest.mark.usefixtures("translator")
 @pytest.mark.parametrize(
     "string,p,exp",
     [
@@ -61,3 +71,31 @@ def test_add_bytes(string, p, length, exp):
 def test_backtranslation(string, p, exp):
     res = sentence.add_backtranslation(string, p)
     assert res == exp
+
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("translator")
+@pytest.mark.parametrize(
+    "strings,p,exp",
+    [
+        ([], 1.0, []),
+        (["", "this is a test"], 0.0, ["", "this is a test"]),
+        (
+            ["this is a test", "", "He asked if she said it"],
+            1.0,
+            ["This is a test", "", "He asked if she had said it"],
+        ),
+    ],
+)
+def test_backtranslation_batch(strings, p, exp):
+    res = sentence.add_backtranslation_batch(strings, p)
+    assert res == exp
+
+
+def test_backtranslation_empty_draws_nothing():
+    niacin.seed(42)
+    exp = _rng.RNG.random()
+    niacin.seed(42)
+    assert sentence.add_backtranslation("", 1.0) == ""
+    assert sentence.add_backtranslation_batch(["", ""], 1.0) == ["", ""]
+    assert _rng.RNG.random() == exp
@@ -3,6 +3,7 @@
 
 import pytest
 
+import niacin
 from niacin.text.en import word
 
 
@@ -95,6 +96,45 @@ def test_add_parens(string, p, exp):
     res = word.add_parens(string, p)
     assert res == exp
 
+
+@pytest.mark.parametrize(
+    "fn,batch_fn,strings",
+    [
+        (word.add_parens, word.add_parens_batch, ["", "dog", "The man has a dog"]),
+        (
+            word.add_misspelling,
+            word.add_misspelling_batch,
+            ["politician persuades", "", "dramatic rhythms"],
+        ),
+    ],
+)
+@pytest.mark.parametrize("p", [0.0, 1.0])
+def test_batch(fn, batch_fn, strings, p):
+    res = batch_fn(strings, p)
+    assert res == [fn(string, p) for string in strings]
+
+
+@pytest.mark.parametrize(
+    "fn,batch_fn",
+    [
+        (word.add_parens, word.add_parens_batch),
+        (word.add_misspelling, word.add_misspelling_batch),
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_seeded(fn, batch_fn, seed):
+    # one draw over all words is the same as one draw over the joined text, so
+    # positions must land in the right string at the right offset
+    strings = ["The man has a dog", "", "politician persuades", "dramatic rhythms"]
+    niacin.seed(seed)
+    res = batch_fn(strings, 0.5)
+    niacin.seed(seed)
+    exp = fn(" ".join(string for string in strings if string), 0.5)
+    assert len(res) == len(strings)
+    assert res[1] == ""
+    assert " ".join(string for string in res if string) == exp
+
+
 @pytest.mark.parametrize(
     "string,p,exp",
     [
@@ -7,17 +7,32 @@ import pytest
 import numpy as np
 from scipy.fft import rfft
 
+import niacin
 from niacin.timeseries import freq
 
 
+def _sin(n):
+    x = np.sin(np.linspace(0, 6*np.pi, n))
+    x.setflags(write=False)
+    return x
+
+
+SIGNALS = {"sin_64": _sin(64), "sin_65": _sin(65), "sin_128": _sin(128)}
+
+
+@pytest.fixture
+def x(request):
+    return SIGNALS[request.param]
+
+
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.02),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.01),
-    ]
+        ("sin_128", 0.0, 0.0),
+        ("sin_128", 1.0, 0.0),
+        ("sin_128", 0.0, 1.0),
+        ("sin_128", 1.0, 0.02),
+        ("sin_128", 1.0, 0.01),
+    ], indirect=["x"]
 )
 def test_add_discrete_phase_shifts(x, p, m):
     res = freq.add_discrete_phase_shifts(x, p, m)
@@ -25,18 +40,19 @@ def test_add_discrete_phase_shifts(x, p, m):
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).all()
+        assert not np.array_equal(res, x)
         f_res = rfft(res)
         assert f_res.argmax() in (2, 3, 4)
 
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.5),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 0.5),
+        ("sin_65", 1.0, 0.5),
+    ], indirect=["x"]
 )
 def test_add_high_frequency_noise(x, p, m):
     res = freq.add_high_frequency_noise(x, p, m)
@@ -44,7 +60,7 @@ def test_add_high_frequency_noise(x, p, m):
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).all()
+        assert (res != x).all()
         f_x = rfft(x)
         f_res = rfft(res)
         np.testing.assert_almost_equal(f_res[:-1], f_x[:-1])
@@ -53,11 +69,11 @@ def test_add_high_frequency_noise(x, p, m):
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_add_random_frequency_noise(x, p, m):
     res = freq.add_random_frequency_noise(x, p, m)
@@ -65,19 +81,16 @@ def test_add_random_frequency_noise(x, p, m):
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).all()
-        f_x = rfft(x)
-        f_res = rfft(res)
-        assert np.not_equal(res, x).all()
+        assert not np.array_equal(res, x)
 
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_remove_random_frequency(x, p, m):
     res = freq.remove_random_frequency(x, p, m)
@@ -86,3 +99,43 @@ def test_remove_random_frequency(x, p, m):
         np.testing.assert_almost_equal(res, x)
     else:
         assert res.sum() == 0
+
+
+@pytest.mark.parametrize(
+    "fn", [
+        freq.add_discrete_phase_shifts,
+        freq.add_high_frequency_noise,
+        freq.add_random_frequency_noise,
+        freq.remove_random_frequency,
+    ]
+)
+def test_seed(fn):
+    x = SIGNALS["sin_64"]
+    niacin.seed(42)
+    exp = fn(x, 0.5, 0.5)
+    niacin.seed(42)
+    res = fn(x, 0.5, 0.5)
+    np.testing.assert_array_equal(res, exp)
+
+
+@pytest.mark.parametrize(
+    "fn", [
+        freq.add_discrete_phase_shifts,
+        freq.add_high_frequency_noise,
+        freq.add_random_frequency_noise,
+        freq.remove_random_frequency,
+    ]
+)
+@pytest.mark.parametrize(
+    "dtype,exp", [
+        (np.float32, np.float32),
+        (np.float64, np.float64),
+        (np.int16, np.float64),
+    ]
+)
+@pytest.mark.parametrize("p", [0.0, 1.0])
+def test_length_dtype(fn, dtype, exp, p):
+    x = (SIGNALS["sin_65"] * 100).astype(dtype)
+    res = fn(x, p, 0.5)
+    assert len(res) == len(x)
+    assert res.dtype == exp
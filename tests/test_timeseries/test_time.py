@@ -5,18 +5,37 @@
 import pytest
 
 import numpy as np
+from scipy import interpolate
 from scipy.fft import rfft
 
+import niacin
 from niacin.timeseries import time
 
 
+def _sin(n):
+    x = np.sin(np.linspace(0, 6*np.pi, n))
+    x.setflags(write=False)
+    return x
+
+
+X = _sin(64)
+# test_add_spike uses the odd length, as +-s spikes on an odd number of
+# entries can never sum to zero
+SIGNALS = {"sin_64": X, "sin_65": _sin(65)}
+
+
+@pytest.fixture
+def x(request):
+    return SIGNALS[request.param]
+
+
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_add_slope_trend(x, p, m):
     res = time.add_slope_trend(x, p, m)
@@ -24,7 +43,7 @@ def test_add_slope_trend(x, p, m):
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res[1:], x[1:]).all()
+        assert (res[1:] != x[1:]).all()
         diff = res - x
         assert diff[0] == 0
         assert diff.sum() != 0
@@ -33,11 +52,11 @@ def test_add_slope_trend(x, p, m):
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_65", 0.0, 0.0),
+        ("sin_65", 1.0, 0.0),
+        ("sin_65", 0.0, 1.0),
+        ("sin_65", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_add_spike(x, p, m):
     res = time.add_spike(x, p, m)
@@ -45,7 +64,7 @@ def test_add_spike(x, p, m):
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).all()
+        assert (res != x).all()
         diff = res - x
         assert diff.sum() != 0
         assert (np.isclose(np.abs(diff), np.nanstd(x))).all()
@@ -53,11 +72,11 @@ def test_add_spike(x, p, m):
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_add_step_trend(x, p, m):
     res = time.add_step_trend(x, p, m)
@@ -65,7 +84,7 @@ def test_add_step_trend(x, p, m):
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).all()
+        assert (res != x).all()
         diff = res - x
         assert diff.sum() != 0
         assert np.isclose(np.abs(diff)[0], np.nanstd(x))
@@ -74,32 +93,107 @@ def test_add_step_trend(x, p, m):
 
 
 @pytest.mark.parametrize(
-    "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.5),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
+    "fn", [
+        time.add_slope_trend,
+        time.add_spike,
+        time.add_step_trend,
+        time.add_warp,
+        time.crop_and_stretch,
+        time.add_slope_trend_batch,
+        time.add_spike_batch,
+        time.add_step_trend_batch,
+    ]
+)
+@pytest.mark.parametrize(
+    "dtype", [np.float32, np.float64, np.complex64, np.complex128]
+)
+def test_dtype(fn, dtype):
+    x = X.astype(dtype)
+    if fn.__name__.endswith('_batch'):
+        x = np.stack([x, x])
+    res = fn(x, 1.0, 0.5)
+    assert res.dtype == dtype
+
+
+@pytest.mark.parametrize(
+    "fn", [
+        time.add_slope_trend,
+        time.add_spike,
+        time.add_step_trend,
+        time.add_slope_trend_batch,
+        time.add_spike_batch,
+        time.add_step_trend_batch,
+    ]
+)
+def test_inplace(fn):
+    x = X.copy()
+    if fn.__name__.endswith('_batch'):
+        x = np.stack([x, x])
+    niacin.seed(42)
+    exp = fn(x, 0.5, 1.0)
+    niacin.seed(42)
+    res = fn(x, 0.5, 1.0, inplace=True)
+    assert res is x
+    np.testing.assert_almost_equal(res, exp)
+
+
+@pytest.mark.parametrize(
+    "x", [
+        X,
+        np.array([1.0, np.nan, 3.0]),
+        np.array([[1.0, 2.0, 4.0], [1.0, np.nan, 3.0]]),
     ]
 )
+def test_std(x):
+    res = time._std(x, axis=-1)
+    np.testing.assert_almost_equal(res, np.nanstd(x, axis=-1))
+
+
+@pytest.mark.parametrize("p,m", [(0.0, 1.0), (1.0, 0.0), (1.0, 1.0)])
+def test_batch(p, m):
+    X = np.sin(np.linspace(0, 6*np.pi, 100)) * np.arange(1, 5)[:, None]
+    s = np.nanstd(X, axis=1)
+    slope = time.add_slope_trend_batch(X, p, m) - X
+    spike = time.add_spike_batch(X, p, m) - X
+    step = time.add_step_trend_batch(X, p, m) - X
+    for diff in (slope, spike, step):
+        assert diff.shape == X.shape
+    if (p == 0.0) or (m == 0.0):
+        for diff in (slope, spike, step):
+            np.testing.assert_almost_equal(diff, 0)
+    else:
+        np.testing.assert_almost_equal(np.abs(slope[:, -1]), s)
+        np.testing.assert_almost_equal(np.abs(spike), s[:, None] * np.ones_like(X))
+        np.testing.assert_almost_equal(np.abs(step[:, 2]), 3*s)
+
+
+@pytest.mark.parametrize(
+    "x,p,m", [
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 0.5),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
+)
 def test_add_warp(x, p, m):
     res = time.add_warp(x, p, m)
     assert len(res) == len(x)
     if (p == 0.0) or (m == 0.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).any()
+        assert not np.array_equal(res, x)
         assert all((x.min() < res) & (res < x.max()))
 
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.5),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+        ("sin_64", 1.0, 0.5),
+    ], indirect=["x"]
 )
 def test_crop_and_stretch(x, p, m):
     res = time.crop_and_stretch(x, p, m)
@@ -109,16 +203,28 @@ def test_crop_and_stretch(x, p, m):
     elif (p == 1.0) and (m == 1.0):
         np.testing.assert_almost_equal(res, x)
     else:
-        assert np.not_equal(res, x).any()
+        assert not np.array_equal(res, x)
+
+
+@pytest.mark.parametrize(
+    "kind", ['linear', 'nearest', 'nearest-up', 'previous', 'next', 'zero', 'cubic']
+)
+def test_interpolate(kind):
+    x = np.sin(np.linspace(0, 6*np.pi, 10))
+    # includes exact samples (1, 9) and a point halfway between two (4.5)
+    num = np.array([0, 7, 10, 33, 45, 81, 90])
+    exp = interpolate.interp1d(np.arange(10), x, kind=kind)(num / 10)
+    res = time._interpolate(x, num, 10, kind)
+    np.testing.assert_almost_equal(res, exp)
 
 
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_flip(x, p, m):
     res = time.flip(x, p, m)
@@ -129,13 +235,21 @@ def test_flip(x, p, m):
         np.testing.assert_almost_equal(-1*res, x)
 
 
+def test_flip_inplace():
+    x = X.copy()
+    exp = -x
+    res = time.flip(x, 1.0, inplace=True)
+    assert res is x
+    np.testing.assert_almost_equal(res, exp)
+
+
 @pytest.mark.parametrize(
     "x,p,m", [
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 0.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 0.0, 1.0),
-        (np.sin(np.linspace(0, 6*np.pi, 100)), 1.0, 1.0),
-    ]
+        ("sin_64", 0.0, 0.0),
+        ("sin_64", 1.0, 0.0),
+        ("sin_64", 0.0, 1.0),
+        ("sin_64", 1.0, 1.0),
+    ], indirect=["x"]
 )
 def test_reverse(x, p, m):
     res = time.reverse(x, p, m)
@@ -143,4 +257,12 @@ def test_reverse(x, p, m):
     if p == 0.0:
         np.testing.assert_almost_equal(res, x)
     else:
-        np.testing.assert_almost_equal(res[::-1], x)
\ No newline at end of file
+        np.testing.assert_almost_equal(res[::-1], x)
+
+
+def test_reverse_inplace():
+    x = X.copy()
+    exp = x[::-1].copy()
+    res = time.reverse(x, 1.0, inplace=True)
+    assert res is x
+    np.testing.assert_almost_equal(res, exp)